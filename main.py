@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
-import random
+import numpy as np
 import pandas as pd
 import json
 from datetime import datetime
@@ -11,38 +12,33 @@ from datetime import datetime
 from src.ingest import read_all
 from src.clean import clean
 from src.kpis import build_tables
-from src.export_excel import write_excel_pack
-from src.charts import generate_charts
-from src.pdf_report import write_pdf_report
 from src.config import resolve_config
-from src.quality import build_quality_report, write_quality_excel
 from src.runlog import write_run_log
 
 
 def make_demo_inputs(input_dir: Path) -> None:
-    random.seed(42)
+    rng = np.random.default_rng(42)
     input_dir.mkdir(parents=True, exist_ok=True)
 
     regions = ["NSW", "VIC", "QLD", "WA"]
     products = ["Widget A", "Widget B", "Widget C"]
 
     def mk(month_start: str, n: int) -> pd.DataFrame:
-        rows = []
-        for _ in range(n):
-            rows.append(
-                {
-                    "Transaction Date": month_start,
-                    " State ": random.choice(regions),
-                    "Sales($)": round(random.uniform(100, 1200), 2),
-                    "COGS": round(random.uniform(40, 700), 2),
-                    "Qty": random.randint(1, 20),
-                    "SKU": random.choice(products),
-                }
-            )
-        df = pd.DataFrame(rows)
-        df.loc[3, "Sales($)"] = ""
-        df.loc[7, "Transaction Date"] = "not a date"
-        return df
+        # Whole columns at once; object dtype so the dirty cells below fit.
+        dates = np.full(n, month_start, dtype=object)
+        sales = rng.uniform(100, 1200, n).round(2).astype(object)
+        sales[3] = ""
+        dates[7] = "not a date"
+        return pd.DataFrame(
+            {
+                "Transaction Date": dates,
+                " State ": rng.choice(regions, n),
+                "Sales($)": sales,
+                "COGS": rng.uniform(40, 700, n).round(2),
+                "Qty": rng.integers(1, 21, n),
+                "SKU": rng.choice(products, n),
+            }
+        )
 
     mk("2025-01-01", 60).to_csv(input_dir / "jan_dump.csv", index=False)
     mk("2025-02-01", 55).to_excel(input_dir / "feb_dump.xlsx", index=False)
@@ -103,78 +99,105 @@ def main(argv: list[str]) -> int:
     result = clean(df_raw, aliases=cfg.aliases)
     tables = build_tables(result.df)
 
-    if cfg.write_cleaned_csv:
-        cleaned_csv = out_dir / "cleaned_data.csv"
-        result.df.to_csv(cleaned_csv, index=False)
-        print(f"🧼 Cleaned data saved: {cleaned_csv}")
-
-    if cfg.write_quality_report:
-        dq_path = out_dir / "data_quality.xlsx"
-        qr = build_quality_report(result.df)
-        try:
-            write_quality_excel(dq_path, qr)
-        except PermissionError:
-            print(f"ERROR: Can't write {dq_path}. Close it if open in Excel, then re-run.", file=sys.stderr)
-        else:
-            print(f"✅ Data quality report created: {dq_path}")
-
-    if cfg.write_excel_pack:
-        out_path = out_dir / "report_pack.xlsx"
-        write_excel_pack(
-            out_path=out_path,
-            summary=tables["Summary"],
-            trends=tables["Trends"],
-            variance=tables["Variance"],
-            drill_region=tables["Drilldown_Region"],
-            drill_product=tables["Drilldown_Product"],
-            warnings=result.warnings,
-            currency_code=cfg.currency_code,
-        )
-        print(f"📦 Excel pack created: {out_path}")
-    else:
-        out_path = out_dir / "report_pack.xlsx"
-
-    charts_dir = out_dir / "charts"
-    created: list[Path] = []
-    if cfg.write_charts or make_pdf:
-        created = generate_charts(
-            trends=tables["Trends"],
-            drill_region=tables["Drilldown_Region"],
-            drill_product=tables["Drilldown_Product"],
-            out_dir=charts_dir,
-        )
-
-        if created:
-            print("📊 Charts saved:")
-            for p in created:
-                print(" -", p)
-        else:
-            print("📊 No charts generated (missing/empty trend or drilldown data).")
-
-    pdf_created = False
-    if make_pdf:
-        pdf_path = out_dir / "report.pdf"
-        try:
-            write_pdf_report(
-                out_path=pdf_path,
+    cleaned_csv = out_dir / "cleaned_data.csv"
+    dq_path = out_dir / "data_quality.xlsx"
+    out_path = out_dir / "report_pack.xlsx"
+
+    # === ARTIFACTS ===
+    # The CSV and the two workbooks don't depend on each other or on the charts,
+    # so they are written on a small pool while charts + PDF are built here.
+    # The PDF needs the chart files, so those two stay in sequence.
+    # Writers are imported only when used (matplotlib/reportlab/openpyxl are slow to load).
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        csv_job = None
+        if cfg.write_cleaned_csv:
+            # pandas' writer on purpose: pyarrow's is faster but quotes strings and
+            # changes float/bool/timestamp formatting in this user-facing file
+            csv_job = pool.submit(result.df.to_csv, cleaned_csv, index=False)
+
+        dq_job = None
+        if cfg.write_quality_report:
+            from src.quality import build_quality_report, write_quality_excel
+
+            dq_job = pool.submit(lambda: write_quality_excel(dq_path, build_quality_report(result.df)))
+
+        pack_job = None
+        if cfg.write_excel_pack:
+            from src.export_excel import write_excel_pack
+
+            pack_job = pool.submit(
+                write_excel_pack,
+                out_path=out_path,
                 summary=tables["Summary"],
                 trends=tables["Trends"],
                 variance=tables["Variance"],
                 drill_region=tables["Drilldown_Region"],
                 drill_product=tables["Drilldown_Product"],
-                chart_paths=created,
-                source_label=str(input_dir),
-                currency_code=cfg.currency_code,
-                report_title=cfg.report_title,
-                report_subtitle=cfg.report_subtitle,
-                notes=cfg.notes,
                 warnings=result.warnings,
+                currency_code=cfg.currency_code,
+            )
+
+        charts_dir = out_dir / "charts"
+        created: list[Path] = []
+        if cfg.write_charts or make_pdf:
+            from src.charts import generate_charts
+
+            created = generate_charts(
+                trends=tables["Trends"],
+                drill_region=tables["Drilldown_Region"],
+                drill_product=tables["Drilldown_Product"],
+                out_dir=charts_dir,
             )
+
+            if created:
+                print("📊 Charts saved:")
+                for p in created:
+                    print(" -", p)
+            else:
+                print("📊 No charts generated (missing/empty trend or drilldown data).")
+
+        pdf_created = False
+        if make_pdf:
+            from src.pdf_report import write_pdf_report
+
+            pdf_path = out_dir / "report.pdf"
+            try:
+                write_pdf_report(
+                    out_path=pdf_path,
+                    summary=tables["Summary"],
+                    trends=tables["Trends"],
+                    variance=tables["Variance"],
+                    drill_region=tables["Drilldown_Region"],
+                    drill_product=tables["Drilldown_Product"],
+                    chart_paths=created,
+                    source_label=str(input_dir),
+                    currency_code=cfg.currency_code,
+                    report_title=cfg.report_title,
+                    report_subtitle=cfg.report_subtitle,
+                    notes=cfg.notes,
+                    warnings=result.warnings,
+                )
+            except PermissionError:
+                print(f"ERROR: Can't write {pdf_path}. Close it if open, then re-run.", file=sys.stderr)
+            else:
+                pdf_created = True
+                print(f"📄 PDF report created: {pdf_path}")
+
+    if csv_job is not None:
+        csv_job.result()
+        print(f"🧼 Cleaned data saved: {cleaned_csv}")
+
+    if dq_job is not None:
+        try:
+            dq_job.result()
         except PermissionError:
-            print(f"ERROR: Can't write {pdf_path}. Close it if open, then re-run.", file=sys.stderr)
+            print(f"ERROR: Can't write {dq_path}. Close it if open in Excel, then re-run.", file=sys.stderr)
         else:
-            pdf_created = True
-            print(f"📄 PDF report created: {pdf_path}")
+            print(f"✅ Data quality report created: {dq_path}")
+
+    if pack_job is not None:
+        pack_job.result()
+        print(f"📦 Excel pack created: {out_path}")
 
     if cfg.write_run_log:
         log_path = out_dir / "run_log.txt"
@@ -2,51 +2,67 @@ from __future__ import annotations
 
 from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from src.kpis import as_datetime
 
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _safe_latest_month(trends: pd.DataFrame) -> pd.Timestamp | None:
-    if "month" not in trends.columns:
-        return None
-    s = pd.to_datetime(trends["month"], errors="coerce")
-    s = s.dropna()
+def _latest_from_dt(months: pd.Series) -> pd.Timestamp | None:
+    s = months.dropna()
     if s.empty:
         return None
     return s.max()
 
 
+def _new_axes():
+    # Object-oriented figure on the Agg canvas: no pyplot global state,
+    # so charts can be drawn from any thread.
+    # Imported here: matplotlib is only loaded once a chart is actually drawn.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def _rotate_xticks(ax) -> None:
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
+
+
 def save_line_chart(x, y, title: str, ylabel: str, out_path: Path) -> None:
-    fig = plt.figure()
-    plt.plot(x, y)
-    plt.title(title)
-    plt.xlabel("Month")
-    plt.ylabel(ylabel)
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
+    fig, ax = _new_axes()
+    ax.plot(x, y)
+    ax.set_title(title)
+    ax.set_xlabel("Month")
+    ax.set_ylabel(ylabel)
+    _rotate_xticks(ax)
+    fig.tight_layout()
     fig.savefig(out_path, dpi=200)
-    plt.close(fig)
 
 
 def save_bar_chart(labels, values, title: str, ylabel: str, out_path: Path, top_n: int = 12) -> None:
     # keep top N by value
-    s = pd.Series(values, index=pd.Index(labels, dtype=str)).dropna()
+    # set_axis pairs values with labels by position; Series(values, index=...) would
+    # realign a Series input onto the labels, leaving every bar NaN (and no chart)
+    s = pd.Series(values).set_axis(pd.Index(labels, dtype=str)).dropna()
     if s.empty:
         return
     s = s.sort_values(ascending=False).head(top_n)
 
-    fig = plt.figure()
-    plt.bar(s.index.astype(str), s.values)
-    plt.title(title)
-    plt.xlabel("")
-    plt.ylabel(ylabel)
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
+    fig, ax = _new_axes()
+    ax.bar(s.index.astype(str), s.values)
+    ax.set_title(title)
+    ax.set_xlabel("")
+    ax.set_ylabel(ylabel)
+    _rotate_xticks(ax)
+    fig.tight_layout()
     fig.savefig(out_path, dpi=200)
-    plt.close(fig)
 
 
 def generate_charts(
@@ -65,9 +81,9 @@ def generate_charts(
     created: list[Path] = []
 
     # ----- Trend charts -----
-    t = trends.copy()
+    t = trends
     if "month" in t.columns:
-        t["month"] = pd.to_datetime(t["month"], errors="coerce")
+        t = t.assign(month=as_datetime(t["month"]))
 
     if "month" in t.columns and t["month"].notna().any():
         t = t.sort_values("month")
@@ -89,13 +105,11 @@ def generate_charts(
             created.append(p)
 
     # ----- Latest month bar charts -----
-    latest = _safe_latest_month(t)
+    latest = _latest_from_dt(t["month"]) if "month" in t.columns else None
     if latest is not None:
         # Revenue by Region (latest month)
         if not drill_region.empty and {"month", "region", "revenue"}.issubset(drill_region.columns):
-            dr = drill_region.copy()
-            dr["month"] = pd.to_datetime(dr["month"], errors="coerce")
-            dr_latest = dr[dr["month"] == latest].copy()
+            dr_latest = drill_region[as_datetime(drill_region["month"]) == latest]
             if not dr_latest.empty:
                 p = out_dir / "latest_month_revenue_by_region.png"
                 save_bar_chart(
@@ -109,9 +123,7 @@ def generate_charts(
 
         # Revenue by Product (latest month)
         if not drill_product.empty and {"month", "product", "revenue"}.issubset(drill_product.columns):
-            dp = drill_product.copy()
-            dp["month"] = pd.to_datetime(dp["month"], errors="coerce")
-            dp_latest = dp[dp["month"] == latest].copy()
+            dp_latest = drill_product[as_datetime(drill_product["month"]) == latest]
             if not dp_latest.empty:
                 p = out_dir / "latest_month_revenue_by_product.png"
                 save_bar_chart(
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional: falls back to pandas string methods
+    pa = None
+
+
+_NONWORD = re.compile(r"[^\w]+")
+_MULTI_US = re.compile(r"_+")
+
 
 def _snake(s: str) -> str:
-    s = s.strip()
-    s = re.sub(r"[^\w]+", "_", s)      # spaces/punct -> _
-    s = re.sub(r"_+", "_", s)
+    s = _NONWORD.sub("_", s.strip())      # spaces/punct -> _
+    s = _MULTI_US.sub("_", s)
     return s.lower().strip("_")
 
 
@@ -44,6 +54,10 @@ DEFAULT_ALIASES = {
 
 REQUIRED = ["date", "revenue"]  # minimal to build a usable report
 
+NA_TOKENS = ["", "nan", "None", "NULL", "null"]  # treated as missing after stripping
+
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")  # day 0 of Excel's 1900 date system
+
 
 @dataclass(frozen=True)
 class CleanResult:
@@ -51,73 +65,100 @@ class CleanResult:
     warnings: list[str]
 
 
-def standardise_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+def standardise_columns(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    if copy:
+        df = df.copy()
     df.columns = [_snake(str(c)) for c in df.columns]
     return df
 
 
-def apply_aliases(df: pd.DataFrame, aliases: dict[str, str] | None = None) -> pd.DataFrame:
-    df = df.copy()
+def _coalesce_columns(block: pd.DataFrame) -> pd.Series:
+    """First non-null value per row, scanning the columns left to right."""
+    if pa is not None:
+        try:
+            arrs = [pa.array(block.iloc[:, k], from_pandas=True) for k in range(block.shape[1])]
+            merged = pc.coalesce(*arrs)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass  # mismatched types across the duplicates
+        else:
+            return merged.to_pandas().set_axis(block.index)
+
+    # one horizontal back-fill == combine_first left-to-right
+    return block.bfill(axis=1).iloc[:, 0]
+
+
+def apply_aliases(df: pd.DataFrame, aliases: dict[str, str] | None = None, copy: bool = True) -> pd.DataFrame:
+    if copy:
+        df = df.copy()
     aliases = aliases or DEFAULT_ALIASES
 
     ren: dict[str, str] = {}
     for c in df.columns:
         if c in aliases:
             ren[c] = aliases[c]
-    df = df.rename(columns=ren)
+    df.rename(columns=ren, inplace=True)
 
     # If duplicates appear after aliasing (e.g. sales + revenue),
     # keep the first non-null across duplicates.
-    # Example: two columns both renamed to "revenue".
-    if df.columns.duplicated().any():
-        # Build a new DF with merged duplicates
-        out = pd.DataFrame()
-        for col in pd.unique(df.columns):
-            cols = [c for c in df.columns if c == col]
-            if len(cols) == 1:
-                out[col] = df[col]
-            else:
-                # combine_first left-to-right
-                s = df[cols[0]]
-                for k in cols[1:]:
-                    s = s.combine_first(df[k])
-                out[col] = s
-        df = out
+    # Only the duplicated names are merged; other columns are left as they are.
+    dup = df.columns.duplicated()
+    if dup.any():
+        merged: dict[str, pd.Series] = {}
+        for col in dict.fromkeys(df.columns[dup]):
+            # positional access: df[col] would return every duplicate as a frame
+            block = df.iloc[:, df.columns.get_indexer_for([col])]
+            merged[col] = _coalesce_columns(block)
+        df = df.loc[:, ~dup].assign(**merged)
 
     return df
 
 
-def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+def _clean_strings(s: pd.Series) -> pd.Series:
+    """Strip whitespace and turn NA-like tokens into missing values."""
+    if pa is not None:
+        try:
+            arr = pa.array(s, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None  # mixed types (e.g. numbers in a text column)
+        if arr is not None:
+            arr = pc.utf8_trim_whitespace(arr)
+            is_token = pc.is_in(arr, value_set=pa.array(NA_TOKENS, type=pa.string()))
+            arr = pc.if_else(is_token, pa.scalar(None, type=pa.string()), arr)
+            # back to pandas' default text dtype, same as the fallback below
+            return arr.to_pandas().set_axis(s.index).rename(s.name)
+
+    s = s.astype(str).str.strip()
+    s.loc[s.isin(NA_TOKENS)] = pd.NA
+    return s
+
+
+def coerce_types(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    if copy:
+        df = df.copy()
 
     # ---- Date FIRST (robust: normal strings + Excel serials) ----
     if "date" in df.columns:
         s = df["date"]
 
-        # 1) Normal parsing
-        parsed = pd.to_datetime(s, errors="coerce")
-
-        # 2) Excel serial day numbers (often show up as 44927 / "44927.0")
-        num = pd.to_numeric(s, errors="coerce")
-        excel_like = num.between(20000, 60000)  # ~1954 to ~2064
+        # Excel serial day numbers (often show up as 44927 / "44927.0")
+        num = pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        excel_like = (num >= 20000) & (num <= 60000)  # ~1954 to ~2064
 
         if excel_like.any():
-            parsed_excel = pd.to_datetime(
-                num[excel_like],
-                unit="D",
-                origin="1899-12-30",
-                errors="coerce",
-            )
-            parsed.loc[excel_like] = parsed_excel
+            # Text-parse only the non-serial rows, then drop the serials in
+            parsed = pd.to_datetime(s.where(~excel_like), errors="coerce")
+            # NaN outside the serial range, so huge numbers (yyyymmdd, epoch secs) can't overflow
+            serials = EXCEL_EPOCH + pd.to_timedelta(np.where(excel_like, num, np.nan), unit="D")
+            parsed = parsed.mask(excel_like, pd.Series(serials, index=s.index))
+        else:
+            parsed = pd.to_datetime(s, errors="coerce")
 
         df["date"] = parsed
 
     # ---- Then clean strings (EXCLUDE date so we don't break it) ----
     obj_cols = [c for c in df.select_dtypes(include="object").columns if c != "date"]
     for c in obj_cols:
-        df[c] = df[c].astype(str).str.strip()
-        df.loc[df[c].isin(["", "nan", "None", "NULL", "null"]), c] = pd.NA
+        df[c] = _clean_strings(df[c])
 
     # ---- Numerics ----
     for c in ["revenue", "cost", "units"]:
@@ -131,15 +172,20 @@ def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
 def validate(df: pd.DataFrame) -> list[str]:
     warnings: list[str] = []
 
+    # One NA pass over all required columns (date included); reused below.
+    present = [r for r in REQUIRED if r in df.columns]
+    na_counts = df[present].isna().sum()
+    n_rows = len(df)
+
     for r in REQUIRED:
         if r not in df.columns:
             warnings.append(f"Missing required column: '{r}'")
         else:
-            if df[r].isna().mean() > 0.5:
+            if n_rows and na_counts[r] / n_rows > 0.5:
                 warnings.append(f"Column '{r}' has >50% missing values")
 
     if "date" in df.columns:
-        bad = df["date"].isna().sum()
+        bad = na_counts["date"]
         if bad > 0:
             warnings.append(f"Rows with unparseable dates: {bad}")
 
@@ -147,8 +193,9 @@ def validate(df: pd.DataFrame) -> list[str]:
 
 
 def clean(df_raw: pd.DataFrame, aliases: dict[str, str] | None = None) -> CleanResult:
+    # One copy of the raw frame up front; later stages work on it in place.
     df = standardise_columns(df_raw)
-    df = apply_aliases(df, aliases=aliases)
-    df = coerce_types(df)
+    df = apply_aliases(df, aliases=aliases, copy=False)
+    df = coerce_types(df, copy=False)
     warnings = validate(df)
     return CleanResult(df=df, warnings=warnings)
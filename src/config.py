@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # LibYAML (C) parser
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 
 @dataclass(frozen=True)
 class AppConfig:
@@ -28,15 +34,27 @@ class AppConfig:
     write_run_log: bool = True
 
 
-def load_config(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"Config file not found: {path}")
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+@lru_cache(maxsize=8)
+def _parse_config(path: Path, mtime_ns: int) -> dict[str, Any]:
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_SafeLoader) or {}
     if not isinstance(data, dict):
         raise ValueError("Config must be a YAML mapping (key: value)")
     return data
 
 
+def load_config(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        raise FileNotFoundError(f"Config file not found: {path}")
+    # Cached per file + mtime, so an edited config is re-read.
+    # Shallow copy keeps callers from mutating the cached mapping.
+    return dict(_parse_config(path.resolve(), path.stat().st_mtime_ns))
+
+
+_BOOL_MAP = {k: True for k in ("true", "yes", "y", "1", "on")} | {
+    k: False for k in ("false", "no", "n", "0", "off")
+}
+
+
 def _as_bool(x: Any, default: bool) -> bool:
     if x is None:
         return default
@@ -44,12 +62,7 @@ def _as_bool(x: Any, default: bool) -> bool:
         return x
     if isinstance(x, (int, float)):
         return bool(x)
-    s = str(x).strip().lower()
-    if s in {"true", "yes", "y", "1", "on"}:
-        return True
-    if s in {"false", "no", "n", "0", "off"}:
-        return False
-    return default
+    return _BOOL_MAP.get(str(x).strip().lower(), default)
 
 
 def _parse_notes(raw_notes: Any) -> list[str]:
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+from io import BytesIO
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.formatting.rule import ColorScaleRule
 
+from src.kpis import as_datetime, as_numeric
+
 
 HEADER_FILL = PatternFill("solid", fgColor="D9E1F2")  # light blue-grey
 HEADER_FONT = Font(bold=True)
@@ -14,6 +20,13 @@ TITLE_FONT = Font(bold=True, size=12)
 H1_FONT = Font(bold=True, size=16)
 CENTER = Alignment(horizontal="center")
 LEFT = Alignment(horizontal="left")
+THIN = Side(style="thin")
+HEADER_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)  # as pandas 2's to_excel headers
+
+# Header font/fill/alignment as named styles, registered once per workbook.
+# Only the sheets pandas used to write (Summary/Trends/Variance) get the border.
+HEADER_STYLE = "pack_header"
+DF_HEADER_STYLE = "pack_df_header"
 
 
 def _currency_format(currency_code: str) -> str:
@@ -59,52 +72,77 @@ def _is_currency_col(name: str) -> bool:
     return False
 
 
-def _style_header_row(ws, header_row: int, max_col: int) -> None:
-    for c in range(1, max_col + 1):
-        cell = ws.cell(row=header_row, column=c)
-        cell.fill = HEADER_FILL
-        cell.font = HEADER_FONT
-        cell.alignment = CENTER
+def _add_named_styles(book) -> None:
+    book.add_named_style(NamedStyle(HEADER_STYLE, font=HEADER_FONT, fill=HEADER_FILL, alignment=CENTER))
+    book.add_named_style(
+        NamedStyle(DF_HEADER_STYLE, font=HEADER_FONT, fill=HEADER_FILL, border=HEADER_BORDER, alignment=CENTER)
+    )
 
 
-def _auto_fit_columns(ws, min_row: int = 1, max_row: int | None = None, max_col: int | None = None) -> None:
-    if max_row is None:
-        max_row = ws.max_row
-    if max_col is None:
-        max_col = ws.max_column
+def _header_cells(ws, names: list[str], style: str = HEADER_STYLE) -> list:
+    cells = []
+    for name in names:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.style = style
+        cells.append(cell)
+    return cells
 
-    for col in range(1, max_col + 1):
-        max_len = 0
-        for row in range(min_row, max_row + 1):
-            v = ws.cell(row=row, column=col).value
-            if v is None:
-                continue
-            s = str(v)
-            if len(s) > max_len:
-                max_len = len(s)
 
-        width = min(max_len + 2, 45)
+def _text_len(v, seen: dict) -> int:
+    """
+    len(str(v)). Strings are measured directly; other non-numeric values
+    (months, dates) repeat a lot, so their string form is cached in `seen`.
+    """
+    if isinstance(v, str):
+        return len(v)
+    if isinstance(v, (int, float)):
+        return len(str(v))
+    n = seen.get(v)
+    if n is None:
+        n = seen[v] = len(str(v))
+    return n
+
+
+def _measure_row(widths: list[int], row) -> None:
+    for col, v in enumerate(row, start=1):
+        if v is None:
+            continue
+        n = len(str(v))
+        if n > widths[col]:
+            widths[col] = n
+
+
+def _set_column_widths(ws, widths: list[int]) -> None:
+    for col in range(1, len(widths)):
+        width = min(widths[col] + 2, 45)
         ws.column_dimensions[get_column_letter(col)].width = max(10, width)
 
 
-def _apply_formats_by_header(
-    ws,
-    header_row: int,
-    data_start_row: int,
-    data_end_row: int,
-    currency_fmt: str,
-) -> None:
-    headers: dict[int, str] = {}
-    for col in range(1, ws.max_column + 1):
-        v = ws.cell(row=header_row, column=col).value
-        if v is None:
-            continue
-        headers[col] = str(v)
+def _auto_fit_columns(ws, rows: list, max_col: int) -> None:
+    """
+    Set column widths from the longest value in each column.
+    Write-only sheets need widths before the first row is appended, so this
+    measures the rows that are about to be written.
+    """
+    widths = [0] * (max_col + 1)
+    for row in rows:
+        _measure_row(widths, row)
+    _set_column_widths(ws, widths)
+
 
-    for col, name in headers.items():
-        if _is_month_col(name):
+def _column_formats(headers: list[str], currency_fmt: str) -> list[tuple[str | None, str | None]]:
+    """
+    (format for non-text values, format for text values) per column, classified
+    once from the header. Text cells only keep a number format in date/month
+    columns, where the value is a date that didn't parse.
+    """
+    out: list[tuple[str | None, str | None]] = []
+    for name in headers:
+        is_month = _is_month_col(name)
+        is_date = _is_date_col(name)
+        if is_month:
             fmt = MONTH_FMT
-        elif _is_date_col(name):
+        elif is_date:
             fmt = DATE_FMT
         elif _is_percent_col(name):
             fmt = PERCENT_FMT
@@ -114,98 +152,141 @@ def _apply_formats_by_header(
             fmt = currency_fmt
         else:
             fmt = None
+        out.append((fmt, fmt if (is_date or is_month) else None))
+    return out
 
-        if fmt:
-            for r in range(data_start_row, data_end_row + 1):
-                cell = ws.cell(row=r, column=col)
-                if cell.value is None:
-                    continue
-                if isinstance(cell.value, str) and not (_is_date_col(name) or _is_month_col(name)):
-                    continue
-                cell.number_format = fmt
 
-        for r in range(data_start_row, data_end_row + 1):
-            cell = ws.cell(row=r, column=col)
-            if cell.value is None:
+def _formatted_rows(
+    ws,
+    rows: list[tuple],
+    col_formats: list[tuple[str | None, str | None]],
+    widths: list[int],
+) -> list[list]:
+    """
+    Build the cells for each data row and record the longest value per column
+    in the same pass, so every value is visited once.
+    """
+    seen: dict = {}
+    out: list[list] = []
+    for row in rows:
+        cells: list = []
+        for col, (v, (fmt, text_fmt)) in enumerate(zip(row, col_formats), start=1):
+            if v is None:
+                cells.append(None)
                 continue
-            if isinstance(cell.value, str):
+
+            n = _text_len(v, seen)
+            if n > widths[col]:
+                widths[col] = n
+
+            if isinstance(v, str):
+                cell = WriteOnlyCell(ws, value=v)
                 cell.alignment = LEFT
+                if text_fmt:
+                    cell.number_format = text_fmt
+                cells.append(cell)
+            elif fmt:
+                cell = WriteOnlyCell(ws, value=v)
+                cell.number_format = fmt
+                cells.append(cell)
+            else:
+                cells.append(v)
+        out.append(cells)
+    return out
 
 
-def _format_summary_sheet(ws, currency_fmt: str) -> None:
-    ws.freeze_panes = "A2"
-    _style_header_row(ws, header_row=1, max_col=ws.max_column)
+def _df_rows(df: pd.DataFrame) -> list[tuple]:
+    # NA of any kind -> None (an empty cell); +/-inf -> text, like pandas' inf_rep.
+    # mask/where on the object frame, so pandas never downcasts it back to float.
+    obj = df.astype(object).where(df.notna(), None)
+    obj = obj.mask(df.isin([np.inf]), "inf").mask(df.isin([-np.inf]), "-inf")
+    return list(obj.itertuples(index=False, name=None))
 
-    for r in range(2, ws.max_row + 1):
-        metric = ws.cell(row=r, column=1).value
-        val_cell = ws.cell(row=r, column=2)
-        if metric is None or val_cell.value is None:
-            continue
-        m = str(metric).lower()
-
-        if "margin" in m:
-            val_cell.number_format = PERCENT_FMT
-        elif m in {"units", "rows_loaded"}:
-            val_cell.number_format = INT_FMT
-        elif m in {"revenue", "cost", "gross_profit"}:
-            val_cell.number_format = currency_fmt
-        else:
-            if isinstance(val_cell.value, (int, float)):
-                val_cell.number_format = "#,##0.00"
 
-    _auto_fit_columns(ws)
+def _summary_value_format(metric: object, value: object, currency_fmt: str) -> str | None:
+    if metric is None or value is None:
+        return None
+    m = str(metric).lower()
+
+    if "margin" in m:
+        return PERCENT_FMT
+    if m in {"units", "rows_loaded"}:
+        return INT_FMT
+    if m in {"revenue", "cost", "gross_profit"}:
+        return currency_fmt
+    if isinstance(value, (int, float)):
+        return "#,##0.00"
+    return None
+
 
+def _write_summary_sheet(book, summary: pd.DataFrame, currency_fmt: str) -> None:
+    ws = book.create_sheet("Summary")
+    headers = [str(c) for c in summary.columns]
+    rows = _df_rows(summary)
 
-def _format_table_sheet(ws, currency_fmt: str) -> None:
+    _auto_fit_columns(ws, [headers, *rows], max_col=len(headers))
     ws.freeze_panes = "A2"
-    _style_header_row(ws, header_row=1, max_col=ws.max_column)
-    _apply_formats_by_header(
-        ws,
-        header_row=1,
-        data_start_row=2,
-        data_end_row=ws.max_row,
-        currency_fmt=currency_fmt,
-    )
-    _auto_fit_columns(ws)
+
+    ws.append(_header_cells(ws, headers, style=DF_HEADER_STYLE))
+    for row in rows:
+        out = list(row)
+        if len(out) >= 2:
+            fmt = _summary_value_format(out[0], out[1], currency_fmt)
+            if fmt:
+                cell = WriteOnlyCell(ws, value=out[1])
+                cell.number_format = fmt
+                out[1] = cell
+        ws.append(out)
 
 
-def _write_table(ws, df: pd.DataFrame, title: str, startrow: int, currency_fmt: str) -> int:
-    title_row = startrow + 1
-    header_row = startrow + 3
-    data_start = startrow + 4
+def _write_table_sheet(book, name: str, df: pd.DataFrame, currency_fmt: str):
+    ws = book.create_sheet(name)
+    headers = [str(c) for c in df.columns]
 
-    ws.cell(row=title_row, column=1, value=title).font = TITLE_FONT
+    widths = [0] * (len(headers) + 1)
+    _measure_row(widths, headers)
+    rows = _formatted_rows(ws, _df_rows(df), _column_formats(headers, currency_fmt), widths)
+    _set_column_widths(ws, widths)
+    ws.freeze_panes = "A2"
 
-    for j, col in enumerate(df.columns, start=1):
-        ws.cell(row=header_row, column=j, value=str(col))
+    ws.append(_header_cells(ws, headers, style=DF_HEADER_STYLE))
+    for row in rows:
+        ws.append(row)
+    return ws
 
-    for i in range(len(df)):
-        for j, col in enumerate(df.columns, start=1):
-            val = df.iloc[i, j - 1]
-            ws.cell(row=data_start + i, column=j, value=None if pd.isna(val) else val)
 
-    _style_header_row(ws, header_row=header_row, max_col=len(df.columns))
-    if len(df) > 0:
-        _apply_formats_by_header(
-            ws,
-            header_row=header_row,
-            data_start_row=data_start,
-            data_end_row=data_start + len(df) - 1,
-            currency_fmt=currency_fmt,
-        )
+def _write_table(ws, title: str, headers: list[str], rows: list[list]) -> None:
+    # title, blank row, header, data
+    title_cell = WriteOnlyCell(ws, value=title)
+    title_cell.font = TITLE_FONT
+    ws.append([title_cell])
+    ws.append([])
 
-    return startrow + len(df) + 6
+    ws.append(_header_cells(ws, headers))
+    for row in rows:
+        ws.append(row)
 
 
 def _safe_latest_month(trends: pd.DataFrame) -> pd.Timestamp | None:
     if "month" not in trends.columns or trends.empty:
         return None
-    s = pd.to_datetime(trends["month"], errors="coerce").dropna()
+    s = as_datetime(trends["month"]).dropna()
     if s.empty:
         return None
     return s.max()
 
 
+def _top_by_revenue(drill: pd.DataFrame, dim_col: str, latest: pd.Timestamp) -> tuple[str, object]:
+    # Rows for the latest month, selected by mask (the drilldown is not copied)
+    d = drill[as_datetime(drill["month"]) == latest]
+    rev = as_numeric(d["revenue"]).to_numpy(dtype="float64", na_value=np.nan)
+    try:
+        i = int(np.nanargmax(rev))
+    except ValueError:  # no rows, or every revenue is missing
+        return ("", pd.NA)
+    return (str(d[dim_col].iloc[i]), rev[i])
+
+
 def _build_exec_summary_rows(
     summary: pd.DataFrame,
     trends: pd.DataFrame,
@@ -222,15 +303,14 @@ def _build_exec_summary_rows(
     latest = _safe_latest_month(trends)
 
     # MoM from variance (use last non-null row)
-    last_var = variance.copy()
+    last_var = variance
     if "month" in last_var.columns:
-        last_var["month"] = pd.to_datetime(last_var["month"], errors="coerce")
-        last_var = last_var.sort_values("month")
+        last_var = last_var.sort_values("month", key=as_datetime)
 
     def _last_value(col: str):
         if col not in last_var.columns:
             return pd.NA
-        s = pd.to_numeric(last_var[col], errors="coerce").dropna()
+        s = as_numeric(last_var[col]).dropna()
         return s.iloc[-1] if len(s) else pd.NA
 
     rev_mom_pct = _last_value("revenue_mom_pct")
@@ -240,30 +320,12 @@ def _build_exec_summary_rows(
     top_region = ""
     top_region_rev = pd.NA
     if latest is not None and not drill_region.empty and {"month", "region", "revenue"}.issubset(drill_region.columns):
-        dr = drill_region.copy()
-        dr["month"] = pd.to_datetime(dr["month"], errors="coerce")
-        dr = dr[dr["month"] == latest].copy()
-        if not dr.empty:
-            dr["revenue"] = pd.to_numeric(dr["revenue"], errors="coerce")
-            dr = dr.dropna(subset=["revenue"])
-            if not dr.empty:
-                r = dr.loc[dr["revenue"].idxmax()]
-                top_region = str(r.get("region", "Unknown"))
-                top_region_rev = r["revenue"]
+        top_region, top_region_rev = _top_by_revenue(drill_region, "region", latest)
 
     top_product = ""
     top_product_rev = pd.NA
     if latest is not None and not drill_product.empty and {"month", "product", "revenue"}.issubset(drill_product.columns):
-        dp = drill_product.copy()
-        dp["month"] = pd.to_datetime(dp["month"], errors="coerce")
-        dp = dp[dp["month"] == latest].copy()
-        if not dp.empty:
-            dp["revenue"] = pd.to_numeric(dp["revenue"], errors="coerce")
-            dp = dp.dropna(subset=["revenue"])
-            if not dp.empty:
-                r = dp.loc[dp["revenue"].idxmax()]
-                top_product = str(r.get("product", "Unknown"))
-                top_product_rev = r["revenue"]
+        top_product, top_product_rev = _top_by_revenue(drill_product, "product", latest)
 
     latest_label = latest.strftime("%Y-%m") if latest is not None else "N/A"
 
@@ -312,62 +374,59 @@ def _write_exec_summary_sheet(
     currency_code: str,
     currency_fmt: str,
 ) -> None:
-    # Insert at the front
-    if "ExecutiveSummary" in book.sheetnames:
-        ws = book["ExecutiveSummary"]
-        book.remove(ws)
-
-    ws = book.create_sheet("ExecutiveSummary", 0)
-
-    ws["A1"] = "Executive Summary"
-    ws["A1"].font = H1_FONT
-
-    ws["A2"] = "Auto-generated highlights for stakeholders"
-    ws["A2"].alignment = LEFT
+    ws = book.create_sheet("ExecutiveSummary")
 
+    title = "Executive Summary"
+    subtitle = "Auto-generated highlights for stakeholders"
     rows = _build_exec_summary_rows(summary, trends, variance, drill_region, drill_product, currency_code)
 
     start_row = 4
-    for i, (insight, value) in enumerate(rows):
-        r = start_row + i
-        ws.cell(row=r, column=1, value=insight)
-        ws.cell(row=r, column=2, value=value)
-
-    # Header style
-    _style_header_row(ws, header_row=start_row, max_col=2)
-
-    # Formats for specific rows
-    # Revenue MoM row: percent
-    for r in range(start_row + 1, ws.max_row + 1):
-        label = ws.cell(row=r, column=1).value
-        val_cell = ws.cell(row=r, column=2)
+    _auto_fit_columns(ws, [[title], [subtitle], *rows], max_col=2)
+    ws.freeze_panes = f"A{start_row+1}"
 
-        if label == "Revenue MoM" and isinstance(val_cell.value, (int, float)):
-            val_cell.number_format = PERCENT_FMT
+    title_cell = WriteOnlyCell(ws, value=title)
+    title_cell.font = H1_FONT
+    ws.append([title_cell])
 
-        if label == "Margin change (MoM)" and isinstance(val_cell.value, (int, float)):
-            # show margin change as bps-like percent (e.g., -0.0045 -> -0.45%)
-            val_cell.number_format = PERCENT_FMT
+    subtitle_cell = WriteOnlyCell(ws, value=subtitle)
+    subtitle_cell.alignment = LEFT
+    ws.append([subtitle_cell])
+    ws.append([])
 
-        if isinstance(label, str) and "revenue (" in label.lower() and isinstance(val_cell.value, (int, float)):
-            val_cell.number_format = currency_fmt
+    # Header style
+    ws.append(_header_cells(ws, rows[0]))
 
-        if label == "Rows loaded" and isinstance(val_cell.value, (int, float)):
-            val_cell.number_format = INT_FMT
+    # Formats for specific rows
+    for label, value in rows[1:]:
+        fmt = None
+        if isinstance(value, (int, float)):
+            if label == "Revenue MoM":
+                fmt = PERCENT_FMT
+            elif label == "Margin change (MoM)":
+                # show margin change as bps-like percent (e.g., -0.0045 -> -0.45%)
+                fmt = PERCENT_FMT
+            elif isinstance(label, str) and "revenue (" in label.lower():
+                fmt = currency_fmt
+            elif label == "Rows loaded":
+                fmt = INT_FMT
 
-    ws.freeze_panes = f"A{start_row+1}"
-    _auto_fit_columns(ws)
+        if fmt:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.number_format = fmt
+            value = cell
+        ws.append([label, value])
 
 
-def _apply_variance_conditional_formatting(ws) -> None:
+def _apply_variance_conditional_formatting(ws, headers: list[str], max_row: int) -> None:
     """
     Apply red↔green color scale to *_mom_abs and *_mom_pct columns (centered at 0).
     """
-    if ws.max_row < 3:
+    if max_row < 3:
         return
 
-    max_row = ws.max_row
-    max_col = ws.max_column
+    match_cols = [col for col, header in enumerate(headers, start=1) if header.lower().endswith(("_mom_abs", "_mom_pct"))]
+    if not match_cols:
+        return
 
     # Excel-style red/yellow/green scale
     rule = ColorScaleRule(
@@ -380,15 +439,9 @@ def _apply_variance_conditional_formatting(ws) -> None:
         end_color="63BE7B",    # green
     )
 
-    for col in range(1, max_col + 1):
-        header = ws.cell(row=1, column=col).value
-        if header is None:
-            continue
-        h = str(header).lower()
-        if h.endswith("_mom_abs") or h.endswith("_mom_pct"):
-            col_letter = get_column_letter(col)
-            rng = f"{col_letter}2:{col_letter}{max_row}"
-            ws.conditional_formatting.add(rng, rule)
+    for col in match_cols:
+        col_letter = get_column_letter(col)
+        ws.conditional_formatting.add(f"{col_letter}2:{col_letter}{max_row}", rule)
 
 
 def write_excel_pack(
@@ -404,52 +457,67 @@ def write_excel_pack(
     out_path.parent.mkdir(parents=True, exist_ok=True)
     currency_fmt = _currency_format(currency_code)
 
-    with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
-        # Write main tables
-        summary.to_excel(writer, sheet_name="Summary", index=False)
-        trends.to_excel(writer, sheet_name="Trends", index=False)
-        variance.to_excel(writer, sheet_name="Variance", index=False)
-
-        book = writer.book
-
-        # Executive summary tab (uses the same dataframes you already computed)
-        _write_exec_summary_sheet(
-            book,
-            summary=summary,
-            trends=trends,
-            variance=variance,
-            drill_region=drill_region,
-            drill_product=drill_product,
-            currency_code=currency_code,
-            currency_fmt=currency_fmt,
-        )
-
-        # Format the pandas-written sheets
-        ws_sum = writer.sheets["Summary"]
-        ws_tr = writer.sheets["Trends"]
-        ws_var = writer.sheets["Variance"]
-
-        _format_summary_sheet(ws_sum, currency_fmt=currency_fmt)
-        _format_table_sheet(ws_tr, currency_fmt=currency_fmt)
-        _format_table_sheet(ws_var, currency_fmt=currency_fmt)
-
-        # Conditional formatting for variance
-        _apply_variance_conditional_formatting(ws_var)
-
-        # Drilldowns tab
-        ws = book.create_sheet("Drilldowns")
-
-        r = 0
-        if warnings:
-            ws.cell(row=1, column=1, value="WARNINGS").font = TITLE_FONT
-            for i, w in enumerate(warnings, start=2):
-                ws.cell(row=i, column=1, value=w)
-            r = len(warnings) + 3
-
-        r = _write_table(ws, drill_region, "Revenue & GP by Month x Region", startrow=r, currency_fmt=currency_fmt)
-        r = _write_table(ws, drill_product, "Revenue & GP by Month x Product", startrow=r, currency_fmt=currency_fmt)
-
-        _auto_fit_columns(ws)
-
-        if "Sheet" in book.sheetnames:
-            book.remove(book["Sheet"])
+    # Write-only workbook: rows are streamed to disk as they are appended,
+    # so every style, width and freeze pane is decided before a sheet's first row.
+    book = Workbook(write_only=True)
+    _add_named_styles(book)
+
+    # Executive summary tab first (uses the same dataframes you already computed)
+    _write_exec_summary_sheet(
+        book,
+        summary=summary,
+        trends=trends,
+        variance=variance,
+        drill_region=drill_region,
+        drill_product=drill_product,
+        currency_code=currency_code,
+        currency_fmt=currency_fmt,
+    )
+
+    # Main tables
+    _write_summary_sheet(book, summary, currency_fmt=currency_fmt)
+    _write_table_sheet(book, "Trends", trends, currency_fmt=currency_fmt)
+    ws_var = _write_table_sheet(book, "Variance", variance, currency_fmt=currency_fmt)
+
+    # Conditional formatting for variance
+    _apply_variance_conditional_formatting(ws_var, [str(c) for c in variance.columns], max_row=len(variance) + 1)
+
+    # Drilldowns tab
+    ws = book.create_sheet("Drilldowns")
+    widths = [0] * (max(len(drill_region.columns), len(drill_product.columns), 1) + 1)
+    if warnings:
+        for w in ["WARNINGS", *warnings]:
+            _measure_row(widths, [w])
+
+    tables = []
+    for title, df in [
+        ("Revenue & GP by Month x Region", drill_region),
+        ("Revenue & GP by Month x Product", drill_product),
+    ]:
+        headers = [str(c) for c in df.columns]
+        _measure_row(widths, [title])
+        _measure_row(widths, headers)
+        rows = _formatted_rows(ws, _df_rows(df), _column_formats(headers, currency_fmt), widths)
+        tables.append((title, headers, rows))
+    _set_column_widths(ws, widths)
+
+    if warnings:
+        head = WriteOnlyCell(ws, value="WARNINGS")
+        head.font = TITLE_FONT
+        ws.append([head])
+        for w in warnings:
+            ws.append([w])
+        ws.append([])
+        ws.append([])
+
+    for i, (title, headers, rows) in enumerate(tables):
+        if i:
+            for _ in range(3):
+                ws.append([])
+        _write_table(ws, title, headers, rows)
+
+    # Zip the workbook in memory, then hand it to the filesystem in one write
+    # (also means a failed save never leaves a truncated file behind).
+    buf = BytesIO()
+    book.save(buf)
+    out_path.write_bytes(buf.getbuffer())
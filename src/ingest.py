@@ -3,6 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 import pandas as pd
 
+try:
+    import python_calamine  # noqa: F401
+except ImportError:  # optional: pandas picks openpyxl/xlrd
+    python_calamine = None
+
+# Rust reader, much faster than openpyxl on .xlsx; pandas only knows it from 2.2
+_PANDAS_VERSION = tuple(int(p) for p in pd.__version__.split(".")[:2])
+EXCEL_ENGINE = "calamine" if python_calamine is not None and _PANDAS_VERSION >= (2, 2) else None
+
 
 SUPPORTED = {".csv", ".xlsx", ".xls"}
 
@@ -23,7 +32,7 @@ def read_one_file(path: Path) -> pd.DataFrame:
         except UnicodeDecodeError:
             df = pd.read_csv(path, encoding="latin-1")
     else:
-        df = pd.read_excel(path)
+        df = pd.read_excel(path, engine=EXCEL_ENGINE)
 
     # Track lineage
     df["source_file"] = path.name
@@ -35,9 +44,8 @@ def read_all(input_dir: Path) -> pd.DataFrame:
     if not files:
         return pd.DataFrame()
 
-    dfs: list[pd.DataFrame] = []
-    for f in files:
-        df = read_one_file(f)
-        dfs.append(df)
+    # Serial on purpose: a process pool re-imports pandas in every worker under
+    # spawn (Windows/macOS), which costs far more than parsing a few monthly dumps.
+    dfs = [read_one_file(f) for f in files]
 
     return pd.concat(dfs, ignore_index=True)
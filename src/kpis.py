@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+def as_datetime(s: pd.Series) -> pd.Series:
+    # build_tables already hands over datetime months; only parse anything else
+    if is_datetime64_any_dtype(s):
+        return s
+    return pd.to_datetime(s, errors="coerce")
+
+
+def as_numeric(s: pd.Series) -> pd.Series:
+    if is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(s, errors="coerce")
+
+
+def _month_start(dates: pd.Series) -> pd.Series:
+    if isinstance(dates.dtype, np.dtype) and dates.dtype.kind == "M":
+        # plain datetime64: truncate to the month in numpy (NaT stays NaT)
+        months = dates.to_numpy().astype("datetime64[M]").astype(dates.dtype)
+        return pd.Series(months, index=dates.index)
+    return dates.dt.to_period("M").dt.to_timestamp()
 
 
 def _add_month(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # assign() returns a new frame, so the caller's df is left alone
+    # (a lazy copy under pandas 3's copy-on-write, a deep copy on pandas 2)
     if "date" in df.columns:
-        df["month"] = df["date"].dt.to_period("M").dt.to_timestamp()
-    else:
-        df["month"] = pd.NaT
-    return df
+        return df.assign(month=_month_start(df["date"]))
+    return df.assign(month=pd.NaT)
 
 
 def build_tables(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
@@ -35,15 +57,20 @@ def build_tables(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
     df["margin"] = df["gross_profit"] / df["revenue"]
 
     # --- Summary (overall) ---
+    rev_sum = df["revenue"].sum(skipna=True)
+    cost_sum = df["cost"].sum(skipna=True)
+    gp_sum = df["gross_profit"].sum(skipna=True)
+    units_sum = df["units"].sum(skipna=True)
+
     summary = pd.DataFrame(
         {
             "metric": ["revenue", "cost", "gross_profit", "margin", "units", "rows_loaded"],
             "value": [
-                df["revenue"].sum(skipna=True),
-                df["cost"].sum(skipna=True),
-                df["gross_profit"].sum(skipna=True),
-                (df["gross_profit"].sum(skipna=True) / df["revenue"].sum(skipna=True)) if df["revenue"].sum(skipna=True) else pd.NA,
-                df["units"].sum(skipna=True),
+                rev_sum,
+                cost_sum,
+                gp_sum,
+                (gp_sum / rev_sum) if rev_sum else pd.NA,
+                units_sum,
                 len(df),
             ],
         }
@@ -63,10 +90,16 @@ def build_tables(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
     trends["margin"] = trends["gross_profit"] / trends["revenue"]
 
     # --- Variance (MoM) ---
-    variance = trends.copy()
-    for col in ["revenue", "cost", "gross_profit", "units", "margin"]:
-        variance[f"{col}_mom_abs"] = variance[col].diff()
-        variance[f"{col}_mom_pct"] = variance[col].pct_change()
+    # trends is already in month order; diff/pct_change run once over all measures
+    # and the new columns are added in one assign() call.
+    measures = ["revenue", "cost", "gross_profit", "units", "margin"]
+    diffs = trends[measures].diff()
+    pcts = trends[measures].pct_change()
+    mom: dict[str, pd.Series] = {}
+    for col in measures:
+        mom[f"{col}_mom_abs"] = diffs[col]
+        mom[f"{col}_mom_pct"] = pcts[col]
+    variance = trends.assign(**mom)
 
     # --- Drilldowns (for later writing onto one sheet) ---
     by_region = (
@@ -3,7 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.lib import colors
@@ -19,6 +21,8 @@ from reportlab.platypus import (
 )
 from reportlab.lib.styles import getSampleStyleSheet
 
+from src.kpis import as_datetime, as_numeric
+
 
 def _fmt_num(x) -> str:
     if pd.isna(x):
@@ -28,6 +32,13 @@ def _fmt_num(x) -> str:
     return str(x)
 
 
+def _fmt_num_column(s: pd.Series) -> list[str]:
+    """_fmt_num over a whole column; numeric columns skip the per-cell type checks."""
+    if is_numeric_dtype(s):
+        return ["" if na else f"{x:,.2f}" for x, na in zip(s.tolist(), s.isna().tolist())]
+    return [_fmt_num(x) for x in s]
+
+
 def _fmt_currency(x, currency_code: str) -> str:
     if pd.isna(x):
         return "N/A"
@@ -68,23 +79,29 @@ def _kpi_from_summary(summary: pd.DataFrame) -> dict[str, float | str]:
 def _safe_latest_month(trends: pd.DataFrame) -> pd.Timestamp | None:
     if trends is None or trends.empty or "month" not in trends.columns:
         return None
-    s = pd.to_datetime(trends["month"], errors="coerce").dropna()
+    s = as_datetime(trends["month"]).dropna()
     if s.empty:
         return None
     return s.max()
 
 
-def _last_value_by_month(df: pd.DataFrame, col: str) -> float | pd.NA:
-    if df is None or df.empty or col not in df.columns:
-        return pd.NA
-    d = df.copy()
+def _last_values_by_month(df: pd.DataFrame, cols: list[str]) -> dict[str, float | pd.NA]:
+    """Last non-null value of each column in month order (one sort for all columns)."""
+    out: dict[str, float | pd.NA] = {c: pd.NA for c in cols}
+    present = [c for c in cols if df is not None and c in df.columns]
+    if not present or df.empty:
+        return out
+
+    d = df
     if "month" in d.columns:
-        d["month"] = pd.to_datetime(d["month"], errors="coerce")
-        d = d.sort_values("month")
-    s = pd.to_numeric(d[col], errors="coerce").dropna()
-    if s.empty:
-        return pd.NA
-    return float(s.iloc[-1])
+        d = d.sort_values("month", key=as_datetime)
+
+    # forward-fill so the final row holds each column's last non-null value
+    last = d[present].apply(as_numeric).ffill().iloc[-1]
+    for c in present:
+        if pd.notna(last[c]):
+            out[c] = float(last[c])
+    return out
 
 
 def _top_dim_latest_month(
@@ -96,19 +113,18 @@ def _top_dim_latest_month(
     if not need.issubset(drill.columns):
         return ("", pd.NA)
 
-    d = drill.copy()
-    d["month"] = pd.to_datetime(d["month"], errors="coerce")
-    d = d[d["month"] == latest].copy()
+    # Mask on the caller's frame; nothing is copied or re-cast when dtypes are already right
+    d = drill[as_datetime(drill["month"]) == latest]
     if d.empty:
         return ("", pd.NA)
 
-    d[value_col] = pd.to_numeric(d[value_col], errors="coerce")
-    d = d.dropna(subset=[value_col])
-    if d.empty:
+    # one nanargmax over the values, then a positional lookup of the label
+    vals = as_numeric(d[value_col]).to_numpy(dtype="float64", na_value=np.nan)
+    try:
+        i = int(np.nanargmax(vals))
+    except ValueError:  # every value is missing
         return ("", pd.NA)
-
-    r = d.loc[d[value_col].idxmax()]
-    return (str(r.get(dim_col, "Unknown")), float(r[value_col]))
+    return (str(d[dim_col].iloc[i]), float(vals[i]))
 
 
 def _build_exec_insights(
@@ -124,9 +140,10 @@ def _build_exec_insights(
     latest = _safe_latest_month(trends)
     latest_label = latest.strftime("%Y-%m") if latest is not None else "N/A"
 
-    rev_mom_pct = _last_value_by_month(variance, "revenue_mom_pct")
-    gp_mom_pct = _last_value_by_month(variance, "gross_profit_mom_pct")
-    margin_mom_abs = _last_value_by_month(variance, "margin_mom_abs")
+    last = _last_values_by_month(variance, ["revenue_mom_pct", "gross_profit_mom_pct", "margin_mom_abs"])
+    rev_mom_pct = last["revenue_mom_pct"]
+    gp_mom_pct = last["gross_profit_mom_pct"]
+    margin_mom_abs = last["margin_mom_abs"]
 
     top_region, top_region_rev = _top_dim_latest_month(drill_region, "region", "revenue", latest)
     top_product, top_product_rev = _top_dim_latest_month(drill_product, "product", "revenue", latest)
@@ -303,17 +320,20 @@ def write_pdf_report(
     if variance is not None and not variance.empty:
         story.append(PageBreak())
         story.append(Paragraph("Variance Snapshot (Top 12 Rows)", styles["Heading2"]))
-        v = variance.head(12).copy()
+        v = variance.head(12)
 
         keep = [c for c in ["month", "revenue", "revenue_mom_abs", "revenue_mom_pct", "margin", "margin_mom_abs"] if c in v.columns]
         if keep:
             v = v[keep]
 
-        if "month" in v.columns:
-            v["month"] = pd.to_datetime(v["month"], errors="coerce").dt.strftime("%Y-%m")
-
-        v_fmt = v.apply(lambda col: col.map(_fmt_num))
-        table_data = [list(v_fmt.columns)] + v_fmt.values.tolist()
+        # Format column by column, then transpose into table rows
+        cols: dict[object, list[str]] = {}
+        for c in v.columns:
+            s = v[c]
+            if c == "month":
+                s = as_datetime(s).dt.strftime("%Y-%m")
+            cols[c] = _fmt_num_column(s)
+        table_data = [list(cols)] + [list(r) for r in zip(*cols.values())]
 
         tbl = Table(table_data, repeatRows=1)
         tbl.setStyle(
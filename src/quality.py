@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 
 
 @dataclass(frozen=True)
@@ -32,16 +33,22 @@ def build_quality_report(df: pd.DataFrame) -> QualityReport:
         }
     )
 
-    # Missingness
+    # Missingness: one NA mask; the share is derived from the counts (== isna().mean())
+    na_counts = df.isna().sum()
+    try:
+        n_unique = df.nunique(dropna=True).to_numpy()
+    except Exception:  # e.g. unhashable cells: count per column, 0 where it fails
+        n_unique = [_safe_nunique(s) for _, s in df.items()]
+
     missing_by_col = pd.DataFrame(
         {
             "column": df.columns.astype(str),
-            "dtype": df.dtypes.astype(str).values,
-            "missing_count": df.isna().sum().values,
-            "missing_pct": (df.isna().mean() * 100).round(2).values,
-            "n_unique": [ _safe_nunique(df[c]) for c in df.columns ],
+            "dtype": df.dtypes.astype(str).to_numpy(),
+            "missing_count": na_counts.to_numpy(),
+            "missing_pct": (na_counts / n_rows * 100).round(2).to_numpy(),
+            "n_unique": n_unique,
         }
-    ).sort_values(["missing_count", "missing_pct"], ascending=False)
+    ).sort_values("missing_count", ascending=False, kind="stable")  # pct is monotone in count
 
     # Duplicates (whole-row)
     dup_count = int(df.duplicated().sum())
@@ -54,15 +61,18 @@ def build_quality_report(df: pd.DataFrame) -> QualityReport:
 
     # Date range (if date exists)
     if "date" in df.columns:
-        d = pd.to_datetime(df["date"], errors="coerce")
+        d = df["date"]
+        if not is_datetime64_any_dtype(d):  # clean() already parsed it; only parse anything else
+            d = pd.to_datetime(d, errors="coerce")
+        valid = int(d.notna().sum())
         date_range = pd.DataFrame(
             {
                 "metric": ["min_date", "max_date", "rows_with_valid_date", "rows_with_invalid_date"],
                 "value": [
-                    str(d.min()) if d.notna().any() else "",
-                    str(d.max()) if d.notna().any() else "",
-                    int(d.notna().sum()),
-                    int(d.isna().sum()),
+                    str(d.min()) if valid else "",
+                    str(d.max()) if valid else "",
+                    valid,
+                    len(d) - valid,
                 ],
             }
         )
@@ -70,14 +80,24 @@ def build_quality_report(df: pd.DataFrame) -> QualityReport:
         date_range = pd.DataFrame({"metric": ["date_column_present"], "value": [False]})
 
     # Categorical profile (top categories for key dims if present)
+    # Built column-wise from each value_counts result, no per-row dicts
     cat_cols = [c for c in ["region", "product", "source_file"] if c in df.columns]
-    rows = []
+    columns: list[str] = []
+    categories: list = []
+    counts: list[int] = []
     for c in cat_cols:
-        vc = df[c].fillna("Unknown").astype(str).value_counts().head(10)
-        for k, v in vc.items():
-            rows.append({"column": c, "category": k, "count": int(v)})
-
-    categorical_profile = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["column", "category", "count"])
+        # "string" is Arrow-backed on pandas 3 when pyarrow is installed, Python-backed on pandas 2
+        vc = df[c].astype("string").fillna("Unknown").value_counts()
+        # ties broken by label, so the order (and who makes the top 10) is stable
+        vc = vc.sort_index().sort_values(ascending=False, kind="stable").head(10)
+        columns += [c] * len(vc)
+        categories += vc.index.tolist()
+        counts += vc.tolist()
+
+    if columns:
+        categorical_profile = pd.DataFrame({"column": columns, "category": categories, "count": counts})
+    else:
+        categorical_profile = pd.DataFrame(columns=["column", "category", "count"])
 
     return QualityReport(
         overview=overview,
@@ -88,9 +108,21 @@ def build_quality_report(df: pd.DataFrame) -> QualityReport:
     )
 
 
-def write_quality_excel(out_path: Path, qr: QualityReport) -> None:
+# Plain tables with no post-formatting, so the faster xlsxwriter engine is used.
+# Cell text is never meant to be a link or formula.
+XLSXWRITER_OPTIONS = {"strings_to_urls": False, "strings_to_formulas": False}
+
+
+def write_quality_excel(
+    out_path: Path,
+    qr: QualityReport,
+    engine: str = "xlsxwriter",
+    engine_kwargs: dict | None = None,
+) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with pd.ExcelWriter(out_path, engine="openpyxl") as w:
+    if engine_kwargs is None and engine == "xlsxwriter":
+        engine_kwargs = {"options": XLSXWRITER_OPTIONS}
+    with pd.ExcelWriter(out_path, engine=engine, engine_kwargs=engine_kwargs) as w:
         qr.overview.to_excel(w, sheet_name="Overview", index=False)
         qr.date_range.to_excel(w, sheet_name="DateRange", index=False)
         qr.duplicates.to_excel(w, sheet_name="Duplicates", index=False)
@@ -1,7 +1,22 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
-from datetime import datetime
+
+
+_TEMPLATE = """\
+Analyst Reporting Automation Suite - Run Log
+Generated: {generated}
+
+Input dir: {input_dir}
+Output dir: {out_dir}
+Currency: {currency}
+Rows loaded: {rows_loaded}
+Charts generated: {charts_count}
+PDF created: {pdf_created}
+
+Warnings:
+{warnings}"""
 
 
 def write_run_log(
@@ -17,22 +32,14 @@ def write_run_log(
 ) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    lines: list[str] = []
-    lines.append("Analyst Reporting Automation Suite - Run Log")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("")
-    lines.append(f"Input dir: {input_dir}")
-    lines.append(f"Output dir: {out_dir}")
-    lines.append(f"Currency: {currency}")
-    lines.append(f"Rows loaded: {rows_loaded}")
-    lines.append(f"Charts generated: {charts_count}")
-    lines.append(f"PDF created: {pdf_created}")
-    lines.append("")
-    lines.append("Warnings:")
-    if warnings:
-        for w in warnings:
-            lines.append(f"- {w}")
-    else:
-        lines.append("- (none)")
-
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+    text = _TEMPLATE.format(
+        generated=time.strftime('%Y-%m-%d %H:%M:%S'),
+        input_dir=input_dir,
+        out_dir=out_dir,
+        currency=currency,
+        rows_loaded=rows_loaded,
+        charts_count=charts_count,
+        pdf_created=pdf_created,
+        warnings="\n".join(f"- {w}" for w in warnings) if warnings else "- (none)",
+    )
+    out_path.write_text(text, encoding="utf-8")
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.charts import save_bar_chart
+
+
+def test_bar_chart_pairs_series_values_with_labels_by_position(tmp_path):
+    # drilldown columns arrive as Series with a RangeIndex; aligning them to the
+    # string labels instead of pairing by position left every bar NaN (no chart)
+    dr = pd.DataFrame({"region": ["NSW", "VIC", "QLD"], "revenue": [300.0, 100.0, 200.0]})
+    out = tmp_path / "bars.png"
+    save_bar_chart(dr["region"], dr["revenue"], "Revenue by Region", "Revenue", out)
+    assert out.exists() and out.stat().st_size > 0
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.clean import _clean_strings, coerce_types
+
+
+def test_excel_serials_mixed_with_large_numbers():
+    # yyyymmdd ints / epoch seconds sit outside the serial range and must not overflow
+    df = pd.DataFrame({"date": [45658, 20250101, "2025-01-03", 1_700_000_000]})
+    out = coerce_types(df)
+
+    assert out.loc[0, "date"] == pd.Timestamp("2025-01-01")
+    assert out.loc[2, "date"] == pd.Timestamp("2025-01-03")
+    # non-serial numbers go through the normal parser, as before
+    expected = pd.to_datetime(df["date"].iloc[[1, 3]], errors="coerce")
+    assert out["date"].iloc[[1, 3]].tolist() == expected.tolist()
+
+
+def test_clean_strings_returns_default_text_dtype():
+    s = pd.Series([" a ", "NULL", None, "12"], dtype=object, name="region")
+    out = _clean_strings(s)
+
+    # no string[pyarrow]/ArrowDtype leaking into the DQ report or KPI tables
+    assert not isinstance(out.dtype, pd.ArrowDtype)
+    assert out.dtype != "string[pyarrow]"
+    assert out.tolist()[::3] == ["a", "12"]
+    assert out.isna().tolist() == [False, True, True, False]
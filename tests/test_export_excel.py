@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.export_excel import _df_rows
+
+
+def test_df_rows_keeps_infinities_as_text():
+    # pct_change after a zero month / margin on zero revenue
+    df = pd.DataFrame({"revenue_mom_pct": [0.1, np.inf, -np.inf, np.nan]})
+    assert [r[0] for r in _df_rows(df)] == [0.1, "inf", "-inf", None]
+
+
+def test_df_rows_turns_missing_values_into_none():
+    # no inf to replace: the object frame must not be downcast back to NaN/NaT
+    df = pd.DataFrame(
+        {
+            "revenue": [np.nan, 1.5],
+            "month": pd.to_datetime([None, "2025-01-01"]),
+            "region": [None, "NSW"],
+            "units": [2, 3],
+        }
+    )
+    assert _df_rows(df)[0] == (None, None, None, 2)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.quality import build_quality_report
+
+
+def test_top_categories_break_count_ties_by_label():
+    # "b" and "a" tie on count; the order must not depend on the cast path
+    df = pd.DataFrame({"product": ["c", "b", "a", "c", "b", "a", "c", None]})
+    prof = build_quality_report(df).categorical_profile
+    assert prof["category"].tolist() == ["c", "a", "b", "Unknown"]
+    assert prof["count"].tolist() == [3, 2, 2, 1]